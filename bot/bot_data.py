@@ -10,20 +10,16 @@ Contains variables that are used by the bot and other modules.
 
 PERMISSION_DENIED = "You lack the permissions to use this command!"
 
-# Number of groups and status variables depends on the real number of tutor groups
-# Tutor groups attendance lists
-group_1 = []
-group_2 = []
-group_3 = []
-group_4 = []
-group_5 = []
-
-# Tutor groups attendance status
-group_1_status = False
-group_2_status = False
-group_3_status = False
-group_4_status = False
-group_5_status = False
+# The number of entries depends on the real number of tutor groups.
+# Each group keeps its attendance list (in arrival order), a set of the same
+# names for O(1) membership checks and whether messages in DM are accepted.
+GROUPS: dict[str, dict] = {
+    f"g{i}": {"members": [], "members_set": set(), "accepting": False}
+    for i in range(1, 6)
+}
 
 # Lectures data
 lectures = {}
+
+# Guild the bot operates on, cached once the bot is ready.
+primary_guild = None
@@ -10,20 +10,19 @@ A basic bot created for the tutors and instructors of the Introductory Programmi
 
 import asyncio
 import datetime
+import functools
 import json
 import random
 import discord
-import time
-import datetime
 import utility
 import re
 
 from bot import bot_data
 from bot.ui.view import TutorSessionView, DifficultyView, ScoreView, AnnouncementView
-from os import path
-from threading import Thread
+from collections import deque
 from discord import option
 from discord.ext import commands
+from typing import Final
 
 ##################################
 #              INIT              #
@@ -37,11 +36,25 @@ bot = commands.Bot(
     ),
 )
 
+# Ids of the guild entities used by the commands below.
+_STUDENT_ROLE_ID: Final = 1170006871713796208
+_LECTURE_CATEGORY_ID: Final = 1163821148069441566
+
 ###########################################
 #              BOT FUNCTIONS              #
 ###########################################
 
 
+@functools.lru_cache(maxsize=1)
+def _load_secrets() -> dict:
+    """
+    Read the credentials from the secrets file.
+    The parsed content is cached, so the file is only read once.
+    """
+    with open(".secrets.json") as sf:
+        return json.load(sf)
+
+
 def start(token) -> None:
     """
     Startup function.
@@ -50,18 +63,39 @@ def start(token) -> None:
         token :class:`str`: The bot token to use.
     """
 
-    # Verify if the file exists
-    if path.isfile(".secrets.json") is False:
-        raise FileNotFoundError("Secrets file not found!")
-
     # Read the credentials
-    with open(".secrets.json") as sf:
-        secrets = json.load(sf)
+    try:
+        secrets = _load_secrets()
+    except FileNotFoundError:
+        raise FileNotFoundError("Secrets file not found!")
 
     # Run the bot.
     bot.run(secrets[token])
 
 
+# Roles that are allowed to use the restricted commands.
+_ACCESS_ROLES: Final = frozenset(
+    {
+        1170005834336571412,
+        1163821146832130053,
+        1163821146832130055,
+        1170716415205068843,
+    }
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _roles_allowed(role_ids: frozenset) -> bool:
+    """
+    Verify that at least one of the role ids belongs to the access roles.
+    The result is cached, so repeated checks for the same role set are free.
+
+    Args:
+        role_ids :class:`frozenset`: Ids of the roles assigned to the user.
+    """
+    return not _ACCESS_ROLES.isdisjoint(role_ids)
+
+
 def _verify_author_roles(user: discord.User | discord.Member) -> bool:
     """
     Ensure that the user has the required role to use the command.
@@ -69,134 +103,130 @@ def _verify_author_roles(user: discord.User | discord.Member) -> bool:
     Args:
         user :class:`User` | :class:`Member`: The user whose roles are to be verified.
     """
-    access_roles = [
-        1170005834336571412,
-        1163821146832130053,
-        1163821146832130055,
-        1170716415205068843,
-    ]
-    for role in user.roles:
-        if role.id in access_roles:
-            return True
-    return False
+    return _roles_allowed(frozenset(role.id for role in user.roles))
 
 
-def _lectures_loop(
+async def _lectures_loop(
     quiz_view: discord.ui.View,
     lecture_view: discord.ui.View,
-    category_id=1163821148069441566,
-    timeout=30,
+    category_id=_LECTURE_CATEGORY_ID,
 ) -> None:
     """
-    A loop running on a background thread.
-    Uses asyncio to run async functions on the bot event loop.
+    A background task running on the bot event loop.
+    Sleeps until each lecture milestone instead of waking up every minute.
 
     Args:
         quiz_view :class:`discord.ui.View`: View used for the quiz survey.
         lecture_view :class:`discord.ui.View`: View used for the lecture survey.
         category_id :class:`int`: ID of the category where the new text channel should be created.
-        timeout :class:`int`: How many seconds we should wait for a result before raising an error.
     """
 
-    asyncio.set_event_loop(bot.loop)
+    # Look up the guild, the category and the lectures dictionary once.
+    guild = bot.guilds[0]
+    category = guild.get_channel(category_id)
+    lectures = bot_data.lectures
+
     while True:
-        if len(bot_data.lectures.keys()) > 0:
-            key_to_remove = None
-            for key in bot_data.lectures:
-                # Create the expected date by spliting the key from dictionary.
-                key_split = key.split("-")
-                expected_date = datetime.date(
-                    year=int(key_split[0]),
-                    month=int(key_split[1]),
-                    day=int(key_split[2]),
-                )
+        if lectures:
+            # Keys that will be removed from the dictionary.
+            keys_to_remove = []
+            for key, topics in list(lectures.items()):
+                # Create the expected date from the dictionary key.
+                expected_date = datetime.date.fromisoformat(key)
 
                 # The time (hour, minute) should be changed for testing.
+                # Sleep until the beginning of the lecture instead of polling every minute.
+                start_time = datetime.datetime.combine(
+                    expected_date, datetime.time(hour=9, minute=30)
+                )
+                delay = (start_time - datetime.datetime.now()).total_seconds()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
                 # Send the lecture beginning message.
-                if _time_check(expected_date, 9, 29, 35):
-                    # Key that will be removed from the dictionary.
-                    key_to_remove = key
+                if _time_check(expected_date, 9, 29, 35, datetime.datetime.now()):
+                    keys_to_remove.append(key)
 
                     # At the beginning create the new text channel.
-                    test_guild = bot.guilds[0]
-                    text_channel = asyncio.run_coroutine_threadsafe(
-                        coro=test_guild.create_text_channel(
-                            name=f"lecture-{datetime.date.today()}",
-                            category=test_guild.get_channel(category_id),
-                            topic="Lecture Channel",
-                            nsfw=False,
-                        ),
-                        loop=bot.loop,
-                    ).result(timeout)
+                    text_channel = await guild.create_text_channel(
+                        name=f"lecture-{datetime.date.today()}",
+                        category=category,
+                        topic="Lecture Channel",
+                        nsfw=False,
+                    )
 
                     # Send the welcome message with topics list.
-                    _send_message_in_text_channel(
-                        text_channel=text_channel,
-                        message=f"```\nHello, welcome to the lecture!\nThe content of today's lecture is the following:\n{_get_topics(bot_data.lectures.get(key))}\n```",
-                        timeout=timeout,
+                    await text_channel.send(
+                        content=f"```\nHello, welcome to the lecture!\nThe content of today's lecture is the following:\n{_get_topics(topics)}\n```"
                     )
 
-                    # Wait N seconds before sending the quiz survey.
-                    # In this case 5 minutes, until the end of the quiz.
-                    time.sleep(300)
-                    if _time_check(expected_date, 9, 34, 45):
+                    # Sleep until the end of the quiz.
+                    # In this case 5 minutes after the lecture beginning.
+                    quiz_time = datetime.datetime.combine(
+                        expected_date, datetime.time(hour=9, minute=35)
+                    )
+                    await asyncio.sleep(
+                        max((quiz_time - datetime.datetime.now()).total_seconds(), 0)
+                    )
+                    if _time_check(expected_date, 9, 34, 45, datetime.datetime.now()):
                         # Send the quiz survey.
-                        _send_message_in_text_channel(
-                            text_channel=text_channel,
-                            message="```\nPlease share your opinion on the quiz.\n```",
-                            timeout=timeout,
+                        await text_channel.send(
+                            content="```\nPlease share your opinion on the quiz.\n```",
                             view=quiz_view,
                         )
 
-                    # Wait N seconds before sending the lecture survey.
-                    # In this case 6 hours, until the end of the lecture.
-                    time.sleep(21600)
-                    if _time_check(expected_date, 15, 0, 59):
+                    # Sleep until the end of the lecture.
+                    survey_time = datetime.datetime.combine(
+                        expected_date, datetime.time(hour=15, minute=1)
+                    )
+                    await asyncio.sleep(
+                        max((survey_time - datetime.datetime.now()).total_seconds(), 0)
+                    )
+                    if _time_check(expected_date, 15, 0, 59, datetime.datetime.now()):
                         # Send the lecture survey.
-                        _send_message_in_text_channel(
-                            text_channel=text_channel,
-                            message="```\nWe hope you enjoyed our lecture, please tell us how difficult the content presented was for you?\n```",
-                            timeout=timeout,
+                        await text_channel.send(
+                            content="```\nWe hope you enjoyed our lecture, please tell us how difficult the content presented was for you?\n```",
                             view=lecture_view,
                         )
 
-            # Remove the old lecture key.
-            if key_to_remove is not None:
-                bot_data.lectures.pop(key_to_remove)
-                key_to_remove = None
+            # Remove the old lecture keys.
+            for key in keys_to_remove:
+                lectures.pop(key, None)
 
-            # Wait one minute before trying again.
-            time.sleep(60)
+            # Wait one minute before going over the remaining lectures again.
+            await asyncio.sleep(60)
         else:
             # Finish the execution since there are no more elements in the dictionary.
             break
 
 
 def _time_check(
-    expected_date: datetime.date, hour: int, minute_start: int, minute_end: int
+    expected_date: datetime.date,
+    hour: int,
+    minute_start: int,
+    minute_end: int,
+    now: datetime.datetime,
 ) -> bool:
     """
-    Verify that the expected date is equal to the current date,
-    then verify if the current iteration is within the expected time period (e.g. 14:01 - 14:15).
+    Verify that the given timestamp is within the expected time period (e.g. 14:01 - 14:15) on the expected date.
 
     Args:
         expected_date :class:`datetime.date`:
         hour :class:`int`: Expected hour.
         minute_start :class:`int`: Beginning of the time period.
         minute_end :class:`int`: End of the time period.
+        now :class:`datetime.datetime`: Current timestamp, taken once by the caller.
 
     Returns:
         :class:`bool`: Result of the comparison.
     """
-    todays_date = datetime.datetime.now()
-    return (
-        expected_date.year == todays_date.year
-        and expected_date.month == todays_date.month
-        and expected_date.day == todays_date.day
-        and todays_date.hour == hour
-        and todays_date.minute > minute_start
-        and todays_date.minute < minute_end
+    period_start = datetime.datetime.combine(
+        expected_date, datetime.time(hour, minute_start)
+    )
+    period_end = datetime.datetime.combine(
+        expected_date, datetime.time(hour, minute_end)
     )
+    return period_start <= now < period_end
 
 
 def _get_topics(topics_list: list) -> str:
@@ -209,31 +239,9 @@ def _get_topics(topics_list: list) -> str:
     Returns:
         :class:`str`: String that represents the topics list.
     """
-    topics = ""
-    for topic in topics_list:
-        topics = topics + str((topics_list.index(topic) + 1)) + ". " + topic + "\n"
-    return topics
-
-
-def _send_message_in_text_channel(
-    text_channel: discord.TextChannel,
-    message: str,
-    timeout: int,
-    view: discord.ui.View | None = None,
-) -> None:
-    """
-    Send a message in the text channel with the use of threadsafe operations.
-    Uses asyncio to run async functions on the bot event loop.
-
-    Args:
-        text_channel :class:`discord.TextChannel`: Text channel to use.
-        message :class:`str`: Actual message to send.
-        timeout :class:`int`: How many seconds we should wait for a result before raising an error.
-    """
-    asyncio.run_coroutine_threadsafe(
-        coro=text_channel.send(content=message, view=view),
-        loop=bot.loop,
-    ).result(timeout=timeout)
+    return "".join(
+        f"{index}. {topic}\n" for index, topic in enumerate(topics_list, 1)
+    )
 
 
 ########################################
@@ -243,63 +251,43 @@ def _send_message_in_text_channel(
 
 @bot.event
 async def on_ready() -> None:
+    # Cache the guild, so the message handlers don't look it up per message.
+    bot_data.primary_guild = bot.guilds[0]
     # Views creation is deprecated, don't use this code.
-    # Create views for the background process.
-    # quiz_view_for_thread = get_view("quiz", bot)
-    # lecture_view_for_thread = get_view("lecture", bot)
+    # Create views for the background task.
+    # quiz_view = get_view("quiz", bot)
+    # lecture_view = get_view("lecture", bot)
     # # Uncomment when the lecture_loop function is ready or is being tested.
-    # background_thread = Thread(
-    #     target=_lectures_loop,
-    #     args=(
-    #         quiz_view_for_thread,
-    #         lecture_view_for_thread,
-    #     ),
-    #     daemon=True,
-    # )
-    # background_thread.start()
+    # bot.loop.create_task(_lectures_loop(quiz_view, lecture_view))
     print(
         f'-----\nLogged in as {bot.user.name}.\nWith the bot id="{bot.user.id}"\n-----'
     )
 
 
+# Matches an attendance message, e.g. "g5".
+_ATTEND_RE = re.compile(r"^g[1-5]$", re.IGNORECASE)
+
+
 @bot.event
 async def on_message(message: discord.Message) -> None:
-    if message.author == (bot.user or message.author.bot):
+    # Ignore messages sent by the bots, including this one.
+    if message.author.bot:
+        return
+
+    # Only check for the attendance message, everything else is ignored.
+    if _ATTEND_RE.match(message.content) is None:
         return
 
     message_content = message.content.lower()
 
-    # Only check for the attendance message when the input is 2 characters and includes g for the group.
-    if len(message_content) == 2 and "g" in message_content:
-        await utility.add_student_to_attendance_list(
-            message=message,
-            group=bot_data.group_1,
-            status=bot_data.group_1_status,
-            id="g1",
-        )
-        await utility.add_student_to_attendance_list(
-            message=message,
-            group=bot_data.group_2,
-            status=bot_data.group_2_status,
-            id="g2",
-        )
-        await utility.add_student_to_attendance_list(
-            message=message,
-            group=bot_data.group_3,
-            status=bot_data.group_3_status,
-            id="g3",
-        )
+    # Look up the matching group once instead of trying all of them.
+    group = bot_data.GROUPS.get(message_content)
+    if group is not None:
         await utility.add_student_to_attendance_list(
             message=message,
-            group=bot_data.group_4,
-            status=bot_data.group_4_status,
-            id="g4",
-        )
-        await utility.add_student_to_attendance_list(
-            message=message,
-            group=bot_data.group_5,
-            status=bot_data.group_5_status,
-            id="g5",
+            group=group["members"],
+            status=group["accepting"],
+            id=message_content,
         )
 
 
@@ -341,16 +329,22 @@ async def clear(ctx: discord.ApplicationContext, limit: int) -> None:
     description="Gives users without roles (just with @everyone) a student role.",
 )
 async def give_student_role(ctx: discord.ApplicationContext) -> None:
-    student_role = ctx.guild.get_role(1170006871713796208)
+    student_role = ctx.guild.get_role(_STUDENT_ROLE_ID)
     if _verify_author_roles(ctx.author):
         await ctx.respond("Adding new roles! It can take some time...")
-        members = ctx.guild.members
-        for member in members:
-            # Avoid discord complaints
-            time.sleep(0.5)
-            # User without roles should get a Student role.
-            if len(member.roles) == 1:
+        # Users without roles should get a Student role.
+        targets = [member for member in ctx.guild.members if len(member.roles) == 1]
+
+        # Bound the number of outstanding requests, so the bot stays responsive.
+        semaphore = asyncio.Semaphore(5)
+
+        async def add_role(member: discord.Member) -> None:
+            async with semaphore:
+                # The library backs off on 429 responses by itself,
+                # so no extra throttling is needed here.
                 await member.add_roles(student_role)
+
+        await asyncio.gather(*(add_role(member) for member in targets))
         await ctx.channel.send("New roles have been added!")
     else:
         await ctx.respond(bot_data.PERMISSION_DENIED)
@@ -409,6 +403,18 @@ async def attendance(
             )
 
 
+# Base embed layout for the tutor session feedback survey.
+_FEEDBACK_TEMPLATE: Final = {
+    "title": "Tutor Session Feedback",
+    "fields": [
+        {"name": "Participants: 0", "value": "", "inline": False},
+        {"name": "Good", "value": "`0 %`", "inline": True},
+        {"name": "Satisfactory", "value": "`0 %`", "inline": True},
+        {"name": "Poor", "value": "`0 %`", "inline": True},
+    ],
+}
+
+
 @bot.slash_command(
     name="tutor-session-feedback",
     description="Allows students to leave feedback on tutor sessions.",
@@ -422,12 +428,9 @@ async def tutor_session_feedback(
     group_id: str,
 ) -> None:
     if _verify_author_roles(ctx.author):
-        default_value = "`0 %`"
-        embed = discord.Embed(title="Tutor Session Feedback", colour=ctx.author.color)
-        embed.add_field(name="Participants: 0", inline=False, value="")
-        embed.add_field(name="Good", inline=True, value=default_value)
-        embed.add_field(name="Satisfactory", inline=True, value=default_value)
-        embed.add_field(name="Poor", inline=True, value=default_value)
+        embed = discord.Embed.from_dict(
+            {**_FEEDBACK_TEMPLATE, "color": ctx.author.color.value}
+        )
         embed.set_author(
             name="Author: " + ctx.author.display_name, icon_url=ctx.author.avatar.url
         )
@@ -439,6 +442,13 @@ async def tutor_session_feedback(
         await ctx.respond(bot_data.PERMISSION_DENIED)
 
 
+# Matches one numbered list entry, e.g. "12. Question".
+_LIST_ENTRY_RE = re.compile(r"\d+\.\s*([^\n]+)")
+
+# Supported survey button types mapped to their view classes.
+_BUTTON_CLASSES: Final = {"Difficulty": DifficultyView, "Score": ScoreView}
+
+
 @bot.slash_command(
     name="create-complex-survey",
     description="Create a multiple question survey.",
@@ -466,11 +476,7 @@ async def create_complex_survey(
         if len(buttons) == 0:
             return False
 
-        for button in buttons:
-            if button != "Difficulty" and button != "Score":
-                return False
-
-        return True
+        return all(button in _BUTTON_CLASSES for button in buttons)
 
     # Start the interaction.
     await ctx.respond(
@@ -480,17 +486,9 @@ async def create_complex_survey(
 
     # Message processing, create a list only with the questions/button types.
     def get_list(response: discord.Message) -> list:
-        temp = []
-        temp_split = re.split(r"\d\.", response.content)
-        # First element is empty, so remove it.
-        temp_split.pop(0)
-        # Remove the new line character and space at the beginning for each question.
-        for string in temp_split:
-            if string.index(" ") == 0:
-                temp.append(string.replace("\n", "").replace(" ", "", 1))
-            else:
-                temp.append(string.replace("\n", ""))
-        return temp
+        return [
+            match.group(1).rstrip() for match in _LIST_ENTRY_RE.finditer(response.content)
+        ]
 
     # Get list of the questions.
     try:
@@ -540,30 +538,19 @@ async def create_complex_survey(
         )
         return
 
-    # Prepare the dictionary with the views.
-    views_queue = []
-    for type in button_types:
-        match (type):
-            case "Difficulty":
-                views_queue.append(
-                    DifficultyView(
-                        guild=ctx.guild,
-                        topic=main_topic,
-                        display_message=questions.pop(0),
-                        views_queue=views_queue,
-                        disable_after_interaction=True,
-                    )
-                )
-            case "Score":
-                views_queue.append(
-                    ScoreView(
-                        guild=ctx.guild,
-                        topic=main_topic,
-                        display_message=questions.pop(0),
-                        views_queue=views_queue,
-                        disable_after_interaction=True,
-                    )
-                )
+    # Prepare the queue with the views, one per question.
+    # A deque, so taking the next view from the front is O(1).
+    views_queue = deque()
+    for button_type, question in zip(button_types, questions):
+        views_queue.append(
+            _BUTTON_CLASSES[button_type](
+                guild=ctx.guild,
+                topic=main_topic,
+                display_message=question,
+                views_queue=views_queue,
+                disable_after_interaction=True,
+            )
+        )
 
     await channel.send(
         content=f"```{message}```",
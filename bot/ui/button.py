@@ -131,7 +131,7 @@ class DynamicButton(discord.ui.Button):
 
                 # Get the next view
                 index = len(self.view_reference.views_queue)
-                next_view = self.view_reference.views_queue.pop(0)
+                next_view = self.view_reference.views_queue.popleft()
 
                 # Get the student name.
                 save_student_name()
@@ -5,14 +5,22 @@ Contains various views used when interacting with the bot.
 :license: MIT, see LICENSE for more details.
 """
 
+import asyncio
 import discord
 
+from collections import deque
+from itertools import chain
 from discord.enums import ButtonStyle
 from shared import SurveyEntry
-from utility import save_survey_entry_to_csv
+from utility import flush_survey_entries
 from datetime import date
 from bot.ui.button import DynamicButton
 
+# Answer dictionaries shared by every survey entry of the same type.
+_GOOD_FEEDBACK = {"Feedback": "Good"}
+_SATISFACTORY_FEEDBACK = {"Feedback": "Satisfactory"}
+_POOR_FEEDBACK = {"Feedback": "Poor"}
+
 
 class TutorSessionView(discord.ui.View):
     """Represents a custom UI view.
@@ -51,72 +59,78 @@ class TutorSessionView(discord.ui.View):
     def __init__(self, group_id: str):
         super().__init__(timeout=3600, disable_on_timeout=True)
         self.group_id = group_id
-        self.users_interacted_with_view = []
+        self.users_interacted_with_view = set()
         self.users_good_review = []
         self.users_satisfactory_review = []
         self.users_poor_review = []
         self.good_feedback_percentage = 0
         self.mid_feedback_percentage = 0
         self.bad_feedback_percentage = 0
-        self.path = f"./data/tutor_session_feedback/{group_id}_{str(date.today())}.csv"
+        # Lazily built mapping of embed field names to their indices.
+        self._field_idx: dict | None = None
 
     @discord.ui.button(label="Good", style=ButtonStyle.primary)
     async def good_callback(
         self, button: discord.ui.Button, interaction: discord.Interaction
     ):
         if interaction.user.id not in self.users_interacted_with_view:
-            self.users_interacted_with_view.append(interaction.user.id)
-            self.users_good_review.append(
-                SurveyEntry(interaction.user.name, {"Feedback": "Good"})
-            )
+            self.users_interacted_with_view.add(interaction.user.id)
+            self.users_good_review.append(interaction.user.name)
             await interaction.response.edit_message(
                 embed=self.update_percentage(interaction.message.embeds[0])
             )
         else:
-            # Nothing to update
-            await interaction.response.edit_message(embed=interaction.message.embeds[0])
+            # Nothing to update, just acknowledge the interaction.
+            await interaction.response.defer()
 
     @discord.ui.button(label="Satisfactory", style=ButtonStyle.primary)
     async def satisfactory_callback(
         self, button: discord.ui.Button, interaction: discord.Interaction
     ):
         if interaction.user.id not in self.users_interacted_with_view:
-            self.users_interacted_with_view.append(interaction.user.id)
-            self.users_satisfactory_review.append(
-                SurveyEntry(interaction.user.name, {"Feedback": "Satisfactory"})
-            )
+            self.users_interacted_with_view.add(interaction.user.id)
+            self.users_satisfactory_review.append(interaction.user.name)
             await interaction.response.edit_message(
                 embed=self.update_percentage(interaction.message.embeds[0])
             )
         else:
-            # Nothing to update
-            await interaction.response.edit_message(embed=interaction.message.embeds[0])
+            # Nothing to update, just acknowledge the interaction.
+            await interaction.response.defer()
 
     @discord.ui.button(label="Poor", style=ButtonStyle.primary)
     async def poor_callback(
         self, button: discord.ui.Button, interaction: discord.Interaction
     ):
         if interaction.user.id not in self.users_interacted_with_view:
-            self.users_interacted_with_view.append(interaction.user.id)
-            self.users_poor_review.append(
-                SurveyEntry(interaction.user.name, {"Feedback": "Poor"})
-            )
+            self.users_interacted_with_view.add(interaction.user.id)
+            self.users_poor_review.append(interaction.user.name)
             await interaction.response.edit_message(
                 embed=self.update_percentage(interaction.message.embeds[0])
             )
         else:
-            # Nothing to update
-            await interaction.response.edit_message(embed=interaction.message.embeds[0])
+            # Nothing to update, just acknowledge the interaction.
+            await interaction.response.defer()
 
     async def on_timeout(self) -> None:
         self.disable_all_items()
-        for list in [
-            self.users_good_review,
-            self.users_satisfactory_review,
-            self.users_poor_review,
-        ]:
-            for entry in list:
-                save_survey_entry_to_csv(self.path, entry)
+        # Materialize the survey entries only now, the callbacks store plain names.
+        # chain lets the flush consume all three lists as one lazy stream.
+        entries = chain(
+            (SurveyEntry(name, _GOOD_FEEDBACK) for name in self.users_good_review),
+            (
+                SurveyEntry(name, _SATISFACTORY_FEEDBACK)
+                for name in self.users_satisfactory_review
+            ),
+            (SurveyEntry(name, _POOR_FEEDBACK) for name in self.users_poor_review),
+        )
+
+        # The path is only needed here, so it is not built at view creation.
+        path = (
+            f"./data/tutor_session_feedback/{self.group_id}_{date.today().isoformat()}.csv"
+        )
+
+        # Write the file on a worker thread, so the event loop is not blocked.
+        await asyncio.to_thread(flush_survey_entries, path, entries)
         return await super().on_timeout()
 
     def update_percentage(self, embed: discord.Embed) -> discord.Embed:
@@ -129,48 +143,29 @@ class TutorSessionView(discord.ui.View):
         Returns:
             :class:`discord.Embed`: Updated Embed.
         """
-        for field in embed.fields:
-            if "Participants" in field.name:
-                field.name = "Participants: " + str(
-                    len(self.users_interacted_with_view)
-                )
-            match field.name:
-                case "Good":
-                    field.value = (
-                        "`"
-                        + str(
-                            format(
-                                len(self.users_good_review)
-                                / (len(self.users_interacted_with_view) / 100),
-                                ".2f",
-                            )
-                        )
-                        + " %`"
-                    )
-                case "Satisfactory":
-                    field.value = (
-                        "`"
-                        + str(
-                            format(
-                                len(self.users_satisfactory_review)
-                                / (len(self.users_interacted_with_view) / 100),
-                                ".2f",
-                            )
-                        )
-                        + " %`"
-                    )
-                case "Poor":
-                    field.value = (
-                        "`"
-                        + str(
-                            format(
-                                len(self.users_poor_review)
-                                / (len(self.users_interacted_with_view) / 100),
-                                ".2f",
-                            )
-                        )
-                        + " %`"
-                    )
+        total = len(self.users_interacted_with_view)
+        # Number of entries behind each feedback field.
+        counts = {
+            "Good": len(self.users_good_review),
+            "Satisfactory": len(self.users_satisfactory_review),
+            "Poor": len(self.users_poor_review),
+        }
+        # Percentage per entry, guarded against a division by zero.
+        percentage = 100.0 / total if total else 0.0
+
+        if self._field_idx is None:
+            # The field layout is fixed, so locate each field only once.
+            self._field_idx = {}
+            for index, field in enumerate(embed.fields):
+                if "Participants" in field.name:
+                    self._field_idx["Participants"] = index
+                else:
+                    self._field_idx[field.name] = index
+
+        fields = embed.fields
+        fields[self._field_idx["Participants"]].name = f"Participants: {total}"
+        for name, count in counts.items():
+            fields[self._field_idx[name]].value = f"`{count * percentage:.2f} %`"
         return embed
 
 
@@ -190,7 +185,7 @@ class AnnouncementView(discord.ui.View):
         The main topic of the current survey.
     guild: :class:`discord.Guild`
         The guild associated with the view.
-    views_queue: :class:`list`
+    views_queue: :class:`collections.deque`
         The views queue that will be used to continue the current interaction and extend the survey.
 
 
@@ -209,19 +204,19 @@ class AnnouncementView(discord.ui.View):
     parent: Optional[:class:`.Interaction`]
         The parent interaction which this view was sent from.
         If ``None`` then the view was not sent using :meth:`InteractionResponse.send_message`.
-    users_interacted_with_view: :class:`list`
-        The list of the user ids that interracted with the view.
+    users_interacted_with_view: :class:`set`
+        The set of the user ids that interracted with the view.
     topic: :class:`str`
         The main topic of the current survey.
     guild: :class:`discord.Guild`
         The guild associated with the view.
-    views_queue: :class:`list`
+    views_queue: :class:`collections.deque`
         The views queue that will be used to continue the current interaction and extend the survey.
     """
 
-    def __init__(self, topic: str, guild: discord.Guild, views_queue: list):
+    def __init__(self, topic: str, guild: discord.Guild, views_queue: deque):
         super().__init__(timeout=8800, disable_on_timeout=True)
-        self.users_interacted_with_view = []
+        self.users_interacted_with_view = set()
         self.topic = topic
         self.guild = guild
         self.views_queue = views_queue
@@ -232,9 +227,9 @@ class AnnouncementView(discord.ui.View):
     ):
         await interaction.response.edit_message(view=self)
         if interaction.user.id not in self.users_interacted_with_view:
-            self.users_interacted_with_view.append(interaction.user.id)
+            self.users_interacted_with_view.add(interaction.user.id)
             # Get the view from the queue and remove it.
-            next_view = self.views_queue.pop(0)
+            next_view = self.views_queue.popleft()
             await interaction.user.send(
                 content=f"```{next_view.display_message}```", view=next_view
             )
@@ -259,7 +254,7 @@ class DifficultyView(discord.ui.View):
         The main topic of the current survey.
     message: :class:`str`
         The message that will be displayed with the view.
-    views_queue: :class:`list`
+    views_queue: :class:`collections.deque`
         The views queue that will be used to continue the current interaction and extend the survey.
     disable_after_interaction: :class:`bool`
         If the view element(s) must be disabled after the interaction is complete.
@@ -289,7 +284,7 @@ class DifficultyView(discord.ui.View):
         The main topic of the current survey.
     display_message: :class:`str`
         The message that will be displayed with the view.
-    views_queue: :class:`list`
+    views_queue: :class:`collections.deque`
         The views queue that will be used to continue the current interaction and extend the survey.
     disable_after_interaction: :class:`bool`
         If the view element(s) must be disabled after the interaction is complete.
@@ -297,12 +292,21 @@ class DifficultyView(discord.ui.View):
         The survey entry that contains the student's name and answers.
     """
 
+    # Label and style of each button attached to the view.
+    _BUTTONS = (
+        ("Very Easy", ButtonStyle.green),
+        ("Easy", ButtonStyle.primary),
+        ("Medium", ButtonStyle.primary),
+        ("Hard", ButtonStyle.primary),
+        ("Very Hard", ButtonStyle.red),
+    )
+
     def __init__(
         self,
         guild: discord.Guild | None = None,
         topic: str | None = "Empty",
         display_message: str | None = "Empty",
-        views_queue: list | None = None,
+        views_queue: deque | None = None,
         disable_after_interaction: bool | None = False,
     ):
         super().__init__(timeout=1800, disable_on_timeout=True)
@@ -314,24 +318,9 @@ class DifficultyView(discord.ui.View):
         self.views_queue = views_queue
         self.disable_after_interaction = disable_after_interaction
         self.survey_entry = SurveyEntry()
-        self.children.append(
-            DynamicButton(
-                label="Very Easy", style=ButtonStyle.green, view_reference=self
-            )
-        )
-        self.children.append(
-            DynamicButton(label="Easy", style=ButtonStyle.primary, view_reference=self)
-        )
-        self.children.append(
-            DynamicButton(
-                label="Medium", style=ButtonStyle.primary, view_reference=self
-            )
-        )
-        self.children.append(
-            DynamicButton(label="Hard", style=ButtonStyle.primary, view_reference=self)
-        )
-        self.children.append(
-            DynamicButton(label="Very Hard", style=ButtonStyle.red, view_reference=self)
+        self.children.extend(
+            DynamicButton(label=label, style=style, view_reference=self)
+            for label, style in self._BUTTONS
         )
 
 
@@ -352,7 +341,7 @@ class ScoreView(discord.ui.View):
         The main topic of the current survey.
     message: :class:`str`
         The message that will be displayed with the view.
-    views_queue: :class:`list`
+    views_queue: :class:`collections.deque`
         The views queue that will be used to continue the current interaction and extend the survey.
     disable_after_interaction: :class:`bool`
         If the view element(s) must be disabled after the interaction is complete.
@@ -382,7 +371,7 @@ class ScoreView(discord.ui.View):
         The main topic of the current survey.
     display_message: :class:`str`
         The message that will be displayed with the view.
-    views_queue: :class:`list`
+    views_queue: :class:`collections.deque`
         The views queue that will be used to continue the current interaction and extend the survey.
     disable_after_interaction: :class:`bool`
         If the view element(s) must be disabled after the interaction is complete.
@@ -390,12 +379,21 @@ class ScoreView(discord.ui.View):
         The survey entry that contains the student's name and answers.
     """
 
+    # Label and style of each button attached to the view.
+    _BUTTONS = (
+        ("20%", ButtonStyle.red),
+        ("40%", ButtonStyle.primary),
+        ("60%", ButtonStyle.primary),
+        ("80%", ButtonStyle.primary),
+        ("100%", ButtonStyle.green),
+    )
+
     def __init__(
         self,
         guild: discord.Guild | None = None,
         topic: str | None = "Empty",
         display_message: str | None = "Empty",
-        views_queue: list | None = None,
+        views_queue: deque | None = None,
         disable_after_interaction: bool | None = False,
     ):
         super().__init__(timeout=1800, disable_on_timeout=True)
@@ -407,18 +405,7 @@ class ScoreView(discord.ui.View):
         self.views_queue = views_queue
         self.disable_after_interaction = disable_after_interaction
         self.survey_entry = SurveyEntry()
-        self.children.append(
-            DynamicButton(label="20%", style=ButtonStyle.red, view_reference=self)
-        )
-        self.children.append(
-            DynamicButton(label="40%", style=ButtonStyle.primary, view_reference=self)
-        )
-        self.children.append(
-            DynamicButton(label="60%", style=ButtonStyle.primary, view_reference=self)
-        )
-        self.children.append(
-            DynamicButton(label="80%", style=ButtonStyle.primary, view_reference=self)
-        )
-        self.children.append(
-            DynamicButton(label="100%", style=ButtonStyle.green, view_reference=self)
+        self.children.extend(
+            DynamicButton(label=label, style=style, view_reference=self)
+            for label, style in self._BUTTONS
         )
@@ -8,14 +8,17 @@ Used to run the specified version of the bot on different discord servers.
 :license: MIT, see LICENSE for more details.
 """
 
+import os
+import sys
+
 import bot
 
-bot_version = input(
-    "What version of the bot would you like to work with? (MAIN or DEV)\n"
-)
+# Take the version from the command line or the environment, so automated
+# (re)starts don't block on stdin, e.g. "python main.py MAIN".
+bot_version = sys.argv[1] if len(sys.argv) > 1 else os.environ.get("BOT_VERSION", "DEV")
 if bot_version == "MAIN":
     bot.start("TOKEN")
 elif bot_version == "DEV":
     bot.start("DEV_TOKEN")
 else:
-    print("Incorrect bot version!")
+    sys.exit("Incorrect bot version!")
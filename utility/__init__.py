@@ -1,4 +1,5 @@
 from .function_utils import (
+    flush_survey_entries,
     save_survey_entry_to_csv,
     add_student_to_attendance_list,
     attendance_cleanup,
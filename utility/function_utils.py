@@ -10,9 +10,10 @@ Contains various functions required for the different elements of the bot.
 
 import discord
 import csv
-import bot
+import os
 
 from bot import bot_data
+from itertools import chain
 from shared import SurveyEntry
 
 ################################################################
@@ -35,10 +36,16 @@ async def add_student_to_attendance_list(
         id :class:`str`: The ID of the tutor group.
     """
 
-    current_guild = bot.bot.guilds[0]
-    member = current_guild.get_member(message.author.id)
-    if status and message.content.lower() == id and member.display_name not in group:
+    member = bot_data.primary_guild.get_member(message.author.id)
+    # Check the membership against the set, the list is kept for display order.
+    members_set = bot_data.GROUPS[id]["members_set"]
+    if (
+        status
+        and message.content.lower() == id
+        and member.display_name not in members_set
+    ):
         group.append(member.display_name)
+        members_set.add(member.display_name)
         await message.channel.send("You are added to the attendance list.")
 
 
@@ -49,29 +56,13 @@ def attendance_cleanup(group_id: str) -> None:
     Args:
         group_id :class:`str`: The ID of the tutor group.
     """
-    match group_id:
-        case "g1":
-            bot_data.group_1.clear()
-            bot_data.group_1_status = False
+    group = bot_data.GROUPS.get(group_id)
+    if group is None:
+        raise RuntimeWarning(DEFAULT_CASE_WARNING)
 
-        case "g2":
-            bot_data.group_2.clear()
-            bot_data.group_2_status = False
-
-        case "g3":
-            bot_data.group_3.clear()
-            bot_data.group_3_status = False
-
-        case "g4":
-            bot_data.group_4.clear()
-            bot_data.group_4_status = False
-
-        case "g5":
-            bot_data.group_5.clear()
-            bot_data.group_5_status = False
-
-        case _:
-            raise RuntimeWarning(DEFAULT_CASE_WARNING)
+    group["members"].clear()
+    group["members_set"].clear()
+    group["accepting"] = False
 
 
 def prepare_group_list_for_embed(id: str) -> str:
@@ -87,35 +78,14 @@ def prepare_group_list_for_embed(id: str) -> str:
     Returns:
         :class:`str`: A list of students.
     """
-    text = ""
-    match id:
-        case "g1":
-            for entry in bot_data.group_1:
-                text += entry + "\n"
-            return text
-
-        case "g2":
-            for entry in bot_data.group_2:
-                text += entry + "\n"
-            return text
-
-        case "g3":
-            for entry in bot_data.group_3:
-                text += entry + "\n"
-            return text
+    group = bot_data.GROUPS.get(id)
+    if group is None:
+        raise RuntimeWarning(DEFAULT_CASE_WARNING)
 
-        case "g4":
-            for entry in bot_data.group_4:
-                text += entry + "\n"
-            return text
-
-        case "g5":
-            for entry in bot_data.group_5:
-                text += entry + "\n"
-            return text
-
-        case _:
-            raise RuntimeWarning(DEFAULT_CASE_WARNING)
+    members = group["members"]
+    if not members:
+        return ""
+    return "\n".join(members) + "\n"
 
 
 def update_dm_accept_status(id: str) -> None:
@@ -128,24 +98,11 @@ def update_dm_accept_status(id: str) -> None:
     Raises:
         :class:`RuntimeWarning`: Occurs when the tutor's group ID does not exist.
     """
-    match id:
-        case "g1":
-            bot_data.group_1_status = True
-
-        case "g2":
-            bot_data.group_2_status = True
-
-        case "g3":
-            bot_data.group_3_status = True
-
-        case "g4":
-            bot_data.group_4_status = True
+    group = bot_data.GROUPS.get(id)
+    if group is None:
+        raise RuntimeWarning(DEFAULT_CASE_WARNING)
 
-        case "g5":
-            bot_data.group_5_status = True
-
-        case _:
-            raise RuntimeWarning(DEFAULT_CASE_WARNING)
+    group["accepting"] = True
 
 
 ####################################################################
@@ -153,6 +110,38 @@ def update_dm_accept_status(id: str) -> None:
 ####################################################################
 
 
+def flush_survey_entries(path: str, entries) -> None:
+    """
+    Writes all survey entries to the csv file in a single pass.
+
+    Args:
+        path :class:`str`: The path to the file.
+        entries :class:`Iterable`: The survey entries that contain the students' answers.
+    """
+    # Peek at the first entry, so any iterable works, not just lists.
+    iterator = iter(entries)
+    first = next(iterator, None)
+    if first is None:
+        return
+
+    # Every entry of the same survey shares the same option keys.
+    keys = list(first.selected_options)
+
+    # Make sure the target directory exists.
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # The entries are already unique, a user can only interact with the view once,
+    # so the file can simply be rewritten in one go.
+    with open(file=path, mode="w", newline="") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["Name", *keys])
+        # Stream the rows straight into the writer instead of materializing them.
+        writer.writerows(
+            [entry.student_name, *(entry.selected_options[key] for key in keys)]
+            for entry in chain((first,), iterator)
+        )
+
+
 def save_survey_entry_to_csv(path: str, entry: SurveyEntry) -> None:
     """
     Adds the student's answers to the csv file.
@@ -161,9 +150,6 @@ def save_survey_entry_to_csv(path: str, entry: SurveyEntry) -> None:
         path :class:`str`: The path to the file.
         entry :class:`SurveryEntry`: The survey entry that contains the student's answers.
     """
-    # Create the file if it doesn't exist.
-    open(file=path, mode="a").close()
-
     header = list(entry.selected_options.keys())
     header.insert(0, "Name")
     # Write the data to a file.